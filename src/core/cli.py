@@ -1,119 +1,70 @@
 import argparse
-from functools import lru_cache
-import os
-import stat
-from typing import Annotated
-from pathlib import Path
+from typing import TYPE_CHECKING, Tuple
 
-from pydantic import BaseModel, DirectoryPath, Field, model_validator
+if TYPE_CHECKING:
+    from core.models import ArgumentsModel
 
 
-class ArgumentsModel(BaseModel):
+def _positive_int(value: str) -> int:
     """
-    Model for command-line arguments.
-
-    Attributes:
-        source (DirectoryPath): Path to the source folder.
-        replica (DirectoryPath): Path to the replica folder.
-        interval (Annotated[int, Field(gt=0)]): Synchronization interval in seconds (must be > 0).
-        log_file (Path): Path to the log file.
-
-    Example:
-        >>> args = ArgumentModel(
-        >>>     source="/path/to/source",
-        >>>     replica="/path/to/replica",
-        >>>     interval=60,
-        >>>     log_file="/path/to/logfile.log"
-        >>> )
-        >>> print(args)
-        ArgumentsModel(source=PosixPath('/path/to/source'),
-                       replica=PosixPath('/path/to/replica'),
-                       interval=60,
-                       log_file=Path('/path/to/logfile.log'))
+    Parse a strictly positive integer command-line value.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a positive integer.
+    """
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive integer")
+    return number
+
+
+# Built once at import; `arguments_parser` only runs the parsing
+_PARSER = argparse.ArgumentParser(description="Synchronize source folder with replica folder.")
+_PARSER.add_argument("source", help="Path to the source folder")
+_PARSER.add_argument("--replica", default=None, help="Path to the replica folder")
+_PARSER.add_argument("--interval", type=int, default=60, help="Synchronization interval in seconds (default: 60)")
+_PARSER.add_argument("--log_file", default=None, help="Path to the log file (default: logfile.log)")
+
+# The simple script also takes options of its own loop, which are not part of `ArgumentsModel`
+_SIMPLE_PARSER = argparse.ArgumentParser(
+    description="Synchronize source folder with replica folder.", parents=[_PARSER], add_help=False
+)
+_SIMPLE_PARSER.add_argument(
+    "--poll", action="store_true", help="Poll the source folder instead of watching it for changes"
+)
+_SIMPLE_PARSER.add_argument(
+    "--workers",
+    type=_positive_int,
+    default=None,
+    help="Number of synchronization threads (default: 4 per CPU, at most 32)",
+)
+_SIMPLE_PARSER.add_argument(
+    "--full_sync_interval",
+    type=_positive_int,
+    default=60 * 60,
+    help="While watching the source folder, seconds after which to synchronize even without changes (default: 3600)",
+)
+
+
+def _parse(parser: argparse.ArgumentParser) -> Tuple["ArgumentsModel", argparse.Namespace]:
     """
+    Parse the command line with `parser` and validate the `ArgumentsModel` fields.
 
-    source: DirectoryPath
-    replica: Path = Field(default=Path(os.getcwd(), "output", "replica"))
-    interval: Annotated[int, Field(gt=0)] = 60
-    log_file: Path = Field(default=Path(os.getcwd(), "output", "logfile.log"))
-
-    @model_validator(mode="before")
-    def check_and_create__directories(cls, values: dict) -> dict:  # noqa: N805
-        """
-        Prevalidate before model is fully initialized.
-        Permission update for 'source' and 'replica' folders.
-
-        Args:
-            cls (self): The class itself (used by Pydantic for validation).
-            values (dict): A dictionary of field names and values.
-
-        Returns:
-            dict: The same dictionary of values after validation, with potential
-                  side effects of creating the log file's parent directory.
-
-        Raises:
-            ValueError: If `log_file` is not specified in the `values` dictionary.
-        """
-        log_file_path = values.get("log_file")
-        source = values.get("source")
-        replica = values.get("replica")
-
-        # Check if source directory exists
-        if not source or not Path(source).exists():
-            raise ValueError(f"The source directory '{source}' does not exist.")
-
-        source = Path(source)
-        if not source.is_absolute():
-            raise ValueError(f"The path '{source}' is not a full path.")
-
-        # Validate replica directory
-        if not replica:
-            replica = Path(os.getcwd(), "output", "replica")
-            values["replica"] = replica
-        else:
-            replica = Path(replica)
-
-        if not replica.is_absolute():
-            raise ValueError(f"The path '{replica}' is not a full path.")
-
-        # Ensure the parent directory of the log file exists
-        if not log_file_path:
-            log_file_path = Path(os.getcwd(), "output", "logfile.log")
-            values["log_file"] = log_file_path
-        log_file_path = Path(log_file_path)
-
-        if not log_file_path.is_absolute():
-            raise ValueError(f"The path '{replica}' is not a full path.")
-
-        if not Path(log_file_path).exists():
-            # folder creation needed for logging
-            log_file_path.parent.mkdir(parents=True, exist_ok=True)
-
-        return values
-
-    @staticmethod
-    def update_permissions(path: Path):
-        """
-        Update permissions of the given directory to ensure read and write access.
-
-        Args:
-            path (Path): Path to the directory or file.
-
-        Raises:
-            ValueError: If the path is not a directory.
-        """
-        # Set permissions to 755 (read/write/execute for owner, read/execute for group/others)
-        for root, dirs, files in os.walk(path):
-            for d in dirs:
-                dir_path = os.path.join(root, d)
-                os.chmod(dir_path, stat.S_IRWXU | stat.S_IRWXG | stat.S_IROTH | stat.S_IXOTH)
-            for f in files:
-                file_path = os.path.join(root, f)
-                os.chmod(file_path, stat.S_IRUSR | stat.S_IWUSR | stat.S_IRGRP | stat.S_IROTH)
-
-
-@lru_cache
-def arguments_parser() -> ArgumentsModel:
+    Returns:
+        Tuple[ArgumentsModel, argparse.Namespace]: The validated arguments, and the remaining options.
+    """
+    args_dict = vars(parser.parse_args())
+
+    # Validate cli arguments. Imported only once parsing succeeded, so `--help` and invalid
+    # command lines exit without loading pydantic.
+    from core.models import ArgumentsModel
+
+    args_model = ArgumentsModel(**{name: args_dict.pop(name) for name in ArgumentsModel.model_fields})
+
+    return args_model, argparse.Namespace(**args_dict)
+
+
+def arguments_parser() -> "ArgumentsModel":
     """
     Uses `argparse` for argument parsing and `pydantic` for validation.
 
@@ -121,17 +72,19 @@ def arguments_parser() -> ArgumentsModel:
         - parse command-line arguments
         - validate them against the `ArgumentsModel` model
         - return the validated arguments as a dictionary.
+
+    The command line is parsed on every call; callers are expected to call it once and keep the result.
     """
-    parser = argparse.ArgumentParser(description="Synchronize source folder with replica folder.")
-    parser.add_argument("source", help="Path to the source folder")
-    parser.add_argument("--replica", default=None, help="Path to the replica folder")
-    parser.add_argument("--interval", type=int, default=60, help="Synchronization interval in seconds (default: 60)")
-    parser.add_argument("--log_file", default=None, help="Path to the log file (default: logfile.log)")
+    args_model, _ = _parse(_PARSER)
+    return args_model
 
-    args = parser.parse_args()
-    args_dict = vars(args)
 
-    # Validate cli arguments
-    args_model = ArgumentsModel(**args_dict)
+def simple_arguments_parser() -> Tuple["ArgumentsModel", argparse.Namespace]:
+    """
+    Like `arguments_parser`, additionally accepting the options of the simple script.
 
-    return args_model
+    Returns:
+        Tuple[ArgumentsModel, argparse.Namespace]: The validated arguments, and the simple script options
+            `poll`, `workers` (None for the synchronizer default) and `full_sync_interval`.
+    """
+    return _parse(_SIMPLE_PARSER)
@@ -1,6 +1,9 @@
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional
+from typing import ClassVar, Dict, Optional, Tuple
 
 
 class MainLogger:
@@ -8,12 +11,27 @@ class MainLogger:
     A logging utility class to handle logging configuration and usage.
     This class sets up a logger with console and optional file handlers.
 
+    Records are handed to the handlers through a queue served by a background thread, so logging
+    never blocks the caller on console or disk writes.
+
+    Loggers are shared: constructing a `MainLogger` with the same name and log file as an open one returns
+    that instance as is, without re-opening the log file or attaching more handlers.
+
     Attributes:
         logger (logging.Logger): The logger instance for this class.
         overwrite (bool): If True, the log file will be overwritten each time.
             If False, logs will be appended. Defaults to False.
     """
 
+    _instances: ClassVar[Dict[Tuple[str, Optional[Path]], "MainLogger"]] = {}
+
+    def __new__(cls, name: str, log_file: Optional[Path] = None, *args, **kwargs) -> "MainLogger":
+        instance = cls._instances.get((name, log_file))
+        if instance is None:
+            instance = super().__new__(cls)
+            cls._instances[(name, log_file)] = instance
+        return instance
+
     def __init__(
         self, name: str, log_file: Optional[Path] = None, log_level: int = logging.DEBUG, overwrite: bool = False
     ) -> None:
@@ -42,6 +60,11 @@ class MainLogger:
 
             >>> logger.logger.error("This is an error message.")
         """
+        if getattr(self, "_listener", None) is not None:
+            # Shared instance, already set up
+            return
+
+        self._key = (name, log_file)
         self.logger = logging.getLogger(name or __name__)
         self.logger.setLevel(log_level)
         formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
@@ -50,16 +73,28 @@ class MainLogger:
         ch = logging.StreamHandler()
         ch.setLevel(log_level)
         ch.setFormatter(formatter)
-        self.logger.addHandler(ch)
+        handlers: list[logging.Handler] = [ch]
 
         # Create file handler if log_file is provided
         if log_file:
             file_mode = "w" if overwrite else "a"
-            log_file.parent.mkdir(parents=True, exist_ok=True)
-            fh = logging.FileHandler(log_file, mode=file_mode)
+            try:
+                fh = logging.FileHandler(log_file, mode=file_mode)
+            except FileNotFoundError:
+                # Only create the parent directory when it is actually missing
+                log_file.parent.mkdir(parents=True, exist_ok=True)
+                fh = logging.FileHandler(log_file, mode=file_mode)
             fh.setLevel(log_level)
             fh.setFormatter(formatter)
-            self.logger.addHandler(fh)
+            handlers.append(fh)
+
+        # Only enqueue records on the logger; the listener thread writes them out
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._queue_handler = QueueHandler(log_queue)
+        self.logger.addHandler(self._queue_handler)
+        self._listener: Optional[QueueListener] = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        self._listener.start()
+        atexit.register(self.close)
 
         # Update user with important metrics and start new logging session
         self._log_start_of_session(log_file, overwrite)
@@ -68,34 +103,57 @@ class MainLogger:
         self.logger.info("\n" + "-" * 50)
         self.logger.info("Starting new logging session")
         if log_file:
-            self.logger.info(f"Log file: {log_file}")
-            self.logger.info(f"Overwrite mode: {'Yes' if overwrite else 'No'}")
+            self.logger.info("Log file: %s", log_file)
+            self.logger.info("Overwrite mode: %s", "Yes" if overwrite else "No")
         else:
             self.logger.info("No log file specified; logging to console only.")
 
-    def info(self, message: str):
+    def close(self) -> None:
+        """
+        Flush pending records and stop the background listener.
+
+        Registered to run at interpreter exit; calling it more than once is harmless. A closed logger is
+        no longer shared, so constructing it again sets up a new one.
+        """
+        if self._listener is None:
+            return
+
+        if self._instances.get(self._key) is self:
+            del self._instances[self._key]
+
+        self.logger.removeHandler(self._queue_handler)
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
+        self._listener = None
+        atexit.unregister(self.close)
+
+    def info(self, message: str, *args: object):
         """
         Log an info level message.
 
         Args:
-            message (str): The message to be logged.
+            message (str): The message to be logged, optionally with `%`-style placeholders.
+            *args (object): Values merged into `message`, only when the record is actually emitted.
         """
-        self.logger.info(message)
+        self.logger.info(message, *args)
 
-    def error(self, message: str):
+    def error(self, message: str, *args: object):
         """
         Log an error level message.
 
         Args:
-            message (str): The message to be logged.
+            message (str): The message to be logged, optionally with `%`-style placeholders.
+            *args (object): Values merged into `message`, only when the record is actually emitted.
         """
-        self.logger.error(message)
+        self.logger.error(message, *args)
 
-    def debug(self, message: str):
+    def debug(self, message: str, *args: object):
         """
         Log a debug level message.
 
         Args:
-            message (str): The message to be logged.
+            message (str): The message to be logged, optionally with `%`-style placeholders.
+            *args (object): Values merged into `message`, only when the record is actually emitted.
         """
-        self.logger.debug(message)
+        self.logger.debug(message, *args)
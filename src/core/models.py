@@ -0,0 +1,139 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import stat
+from typing import Annotated, Any, Self
+from pathlib import Path
+
+from pydantic import BaseModel, ConfigDict, DirectoryPath, Field, ValidationInfo, field_validator, model_validator
+
+# Permissions set by `ArgumentsModel.update_permissions`
+DIR_MODE = stat.S_IRWXU | stat.S_IRWXG | stat.S_IROTH | stat.S_IXOTH  # 775
+FILE_MODE = stat.S_IRUSR | stat.S_IWUSR | stat.S_IRGRP | stat.S_IROTH  # 644
+
+
+class ArgumentsModel(BaseModel):
+    """
+    Model for command-line arguments.
+
+    Attributes:
+        source (DirectoryPath): Path to the source folder.
+        replica (DirectoryPath): Path to the replica folder.
+        interval (Annotated[int, Field(gt=0)]): Synchronization interval in seconds (must be > 0).
+        log_file (Path): Path to the log file.
+
+    Example:
+        >>> args = ArgumentModel(
+        >>>     source="/path/to/source",
+        >>>     replica="/path/to/replica",
+        >>>     interval=60,
+        >>>     log_file="/path/to/logfile.log"
+        >>> )
+        >>> print(args)
+        ArgumentsModel(source=PosixPath('/path/to/source'),
+                       replica=PosixPath('/path/to/replica'),
+                       interval=60,
+                       log_file=Path('/path/to/logfile.log'))
+    """
+
+    # Unknown fields are rejected rather than silently ignored, e.g. by the server's `/update_sync_params/`
+    model_config = ConfigDict(extra="forbid")
+
+    source: DirectoryPath
+    replica: Path = Field(default_factory=lambda: Path.cwd() / "output" / "replica")
+    interval: Annotated[int, Field(gt=0)] = 60
+    log_file: Path = Field(default_factory=lambda: Path.cwd() / "output" / "logfile.log")
+
+    @field_validator("replica", "log_file", mode="before")
+    @classmethod
+    def use_default_when_none(cls, value: Any, info: ValidationInfo) -> Any:
+        """
+        Fall back to the field default when a path is explicitly given as `None`,
+        as `argparse` does for options that were not passed.
+
+        Args:
+            value (Any): The raw value of the field.
+            info (ValidationInfo): Information about the field being validated.
+
+        Returns:
+            Any: The field default if `value` is None, else `value` unchanged.
+        """
+        if value is None and info.field_name:
+            return cls.model_fields[info.field_name].get_default(call_default_factory=True)
+        return value
+
+    @field_validator("source", "replica", "log_file")
+    @classmethod
+    def check_absolute_path(cls, value: Path) -> Path:
+        """
+        Ensure the given path is a full path.
+
+        Args:
+            value (Path): The path, already validated by its field type.
+
+        Returns:
+            Path: The same path.
+
+        Raises:
+            ValueError: If the path is not absolute.
+        """
+        if not value.is_absolute():
+            raise ValueError(f"The path '{value}' is not a full path.")
+        return value
+
+    @model_validator(mode="after")
+    def create_log_file_directory(self) -> Self:
+        """
+        Postvalidate once all fields are validated.
+        Create the parent directory of `log_file`, needed for logging.
+
+        Returns:
+            ArgumentsModel: The validated model, with the side effect of creating the log file's parent directory.
+        """
+        # folder creation needed for logging
+        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+
+        return self
+
+    @staticmethod
+    def update_permissions(*paths: Path):
+        """
+        Update permissions of the given directories to ensure read and write access.
+
+        All directories are walked in a single pass. Only entries whose permissions differ from the target mode
+        are changed, and entries reached more than once (e.g. hard links shared by source and replica) are only
+        checked once.
+
+        Args:
+            *paths (Path): Paths to the directories.
+
+        Raises:
+            ValueError: If the path is not a directory.
+        """
+        # Set permissions to 775 for directories and 644 for files, skipping those already set.
+        # Directories are updated while walking so they can be listed; files are updated in parallel afterwards.
+        outdated_files = []
+        visited = set()
+        pending = [os.fspath(path) for path in paths]
+        while pending:
+            with os.scandir(pending.pop()) as it:
+                for entry in it:
+                    entry_stat = entry.stat()
+                    # Inode numbers are not reported by scandir on Windows. Symlinks are not recorded, as their
+                    # target's inode would make the walk skip the target itself when it is reached.
+                    if entry_stat.st_ino and not entry.is_symlink():
+                        if (entry_stat.st_dev, entry_stat.st_ino) in visited:
+                            continue
+                        visited.add((entry_stat.st_dev, entry_stat.st_ino))
+
+                    if entry.is_dir():
+                        if stat.S_IMODE(entry_stat.st_mode) != DIR_MODE:
+                            os.chmod(entry.path, DIR_MODE)
+                        if not entry.is_symlink():
+                            pending.append(entry.path)
+                    elif stat.S_IMODE(entry_stat.st_mode) != FILE_MODE:
+                        outdated_files.append(entry.path)
+
+        if outdated_files:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                # Consume the results so any error is raised here
+                list(pool.map(lambda file_path: os.chmod(file_path, FILE_MODE), outdated_files))
@@ -1,11 +1,52 @@
+import errno
+import hashlib
+import json
 import os
 import shutil
-import filecmp
+import stat
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple, Union
 
 from core.logger import MainLogger
 
+# Synchronization threads; the work is I/O bound, so more threads than CPUs pay off
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Errors meaning an in-kernel copy is not supported for the given files, rather than a failed copy
+_UNSUPPORTED_COPY_ERRNOS = (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EPERM, errno.ENOTSOCK)
+
+
+def _advise_sequential(fd: int) -> None:
+    """
+    Tell the kernel a file will be read sequentially from start to end, so it reads ahead more aggressively.
+
+    Does nothing on platforms without `os.posix_fadvise`.
+
+    Args:
+        fd (int): The file descriptor of the file about to be read.
+    """
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+
+def _copied_all(fd: int, offset: int) -> bool:
+    """
+    Check the outcome of an in-kernel copy which stopped at `offset`.
+
+    Some filesystems report end of file on the first call without copying anything. Like `shutil`, a copy
+    stopping at offset 0 only counts as done if the source file is empty.
+
+    Args:
+        fd (int): The file descriptor of the source file.
+        offset (int): The number of bytes copied.
+
+    Returns:
+        bool: True if the copy is complete, False if it must be retried another way.
+    """
+    return offset > 0 or os.fstat(fd).st_size == 0
+
 
 class FolderSynchronizer:
     """
@@ -14,22 +55,52 @@ class FolderSynchronizer:
     This class provides functionality to ensure that the `replica` folder mirrors the `source` folder by copying new
     or updated files and directories, and removing any that are no longer present in the source.
 
+    Directories are synchronized concurrently on a thread pool, since the work is dominated by filesystem calls
+    which release the GIL. Call `close`, or use the synchronizer as a context manager, to shut the pool down.
+
+    Content digests of compared files are kept in a manifest keyed by path, so unchanged files are not re-read on
+    later synchronizations. The manifest can be persisted to disk, as JSON, to survive restarts.
+
     Attributes:
         logger (MainLogger): Logger instance for recording operations and events.
+        manifest_file (Optional[Path]): Path where the manifest is persisted, if any.
     """
 
-    def __init__(self, logger: Optional[MainLogger] = None) -> None:
+    def __init__(
+        self, logger: Optional[MainLogger] = None, manifest_file: Optional[Path] = None, workers: Optional[int] = None
+    ) -> None:
         """
         Initialize the FolderSynchronizer with an optional logger.
 
         Args:
             logger (Optional[MainLogger]): An optional `MainLogger` instance for logging operations. If not provided,
                                            a default logger is created.
+            manifest_file (Optional[Path]): An optional path to load the manifest from and save it to with
+                                            `save_manifest`. If not provided, the manifest is kept in memory only.
+            workers (Optional[int]): The number of threads synchronizing directories concurrently. Defaults to
+                                     4 per CPU, at most 32.
         """
         self.logger = logger if logger else MainLogger(name=__name__)
+        self.manifest_file = manifest_file
+        self._pool = ThreadPoolExecutor(max_workers=workers or DEFAULT_WORKERS, thread_name_prefix="sync")
+        self._manifest: Dict[str, Tuple[int, int, int, bytes]] = self._load_manifest()
         self.logger.info("Synchronizer initialized.")
 
-    def sync_folders(self, source_path: Path, replica_path: Path):
+    def close(self) -> None:
+        """
+        Shut down the thread pool, waiting for running synchronizations to finish.
+
+        The synchronizer cannot be used afterwards. Calling it more than once is harmless.
+        """
+        self._pool.shutdown()
+
+    def __enter__(self) -> "FolderSynchronizer":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def sync_folders(self, source_path: Union[str, Path], replica_path: Union[str, Path]):
         """
         Recursively synchronize the `replica` folder to match the `source` folder.
 
@@ -38,7 +109,10 @@ class FolderSynchronizer:
         1. **Copying Files and Directories**:
             - Recursively copies new or updated files and directories from `source_path` to `replica_path`.
             - Directories are created in the replica if they do not exist.
-            - Files are copied only if they are missing or different from the source.
+            - Special files (named pipes, sockets, devices) are skipped.
+            - Files are copied only if they are missing or different from the source. Files with matching size
+              and modification time are skipped without comparing their contents; files with the same content
+              but a different modification time only get their metadata updated.
 
         2. **Removing Excess Files and Directories**:
             - Deletes files and directories from `replica_path` that are not present in `source_path`.
@@ -50,48 +124,262 @@ class FolderSynchronizer:
             - May raise `FileNotFoundError`, `PermissionError`, or `OSError` if issues occur during file operations.
 
         Args:
-            source_path (Path): The path to the source directory.
-            replica_path (Path): The path to the replica directory.
+            source_path (Union[str, Path]): The path to the source directory.
+            replica_path (Union[str, Path]): The path to the replica directory.
 
         Example:
             >>> synchronizer = FolderSynchronizer()
 
             >>> synchronizer.sync_folders(Path("/path/to/source"), Path("/path/to/replica"))
         """
+        # Breadth-first worklist of (source, replica) directory pairs. Each batch of pending directories is
+        # synchronized in one `map` over the pool and yields the subdirectories for the next batch.
+        pending = deque([(os.fspath(source_path), os.fspath(replica_path))])
+        while pending:
+            source_dirs, replica_dirs = zip(*pending)
+            pending.clear()
+            for subdirs in self._pool.map(self._sync_directory, source_dirs, replica_dirs):
+                pending.extend(subdirs)
+
+    def _sync_directory(self, source_path: str, replica_path: str) -> List[Tuple[str, str]]:
+        """
+        Synchronize the direct children of `replica_path` with those of `source_path`.
+
+        Paths are handled as plain strings: source paths come pre-joined from `DirEntry.path` and replica paths are
+        joined once per entry, avoiding a `Path` allocation per entry.
+
+        Args:
+            source_path (str): The path to the source directory.
+            replica_path (str): The path to the replica directory.
+
+        Returns:
+            List[Tuple[str, str]]: The (source, replica) pairs of subdirectories that still need synchronizing.
+        """
+        subdirs = []
+
+        # Collect the entries of both sides in a single pass each; `DirEntry` caches the file type.
+        with os.scandir(source_path) as it:
+            source_entries = {entry.name: entry for entry in it}
+        with os.scandir(replica_path) as it:
+            replica_entries = {entry.name: entry for entry in it}
+
         # Synchronize files and directories from source_path to replica_path.
         self.logger.info("Synchronizing source files and directories to replica...")
-        for item in os.listdir(source_path):
-            source_sub_item = Path(source_path, item)
-            replica_sub_item = Path(replica_path, item)
-
-            self.logger.debug(f"Processing {item}")
-
-            if source_sub_item.is_dir():
-                if not replica_sub_item.exists():
-                    self.logger.debug(f"Directory not found in replica: {replica_sub_item}")
-                    self.logger.debug(f"Creating directory: {replica_sub_item}")
-                    replica_sub_item.mkdir(parents=True, exist_ok=True)
-                self.sync_folders(source_sub_item, replica_sub_item)
+        for item, source_entry in source_entries.items():
+            source_sub_item = source_entry.path
+            replica_sub_item = f"{replica_path}{os.sep}{item}"
+            replica_entry = replica_entries.get(item)
+
+            self.logger.debug("Processing %s", item)
+
+            is_dir = source_entry.is_dir()
+            if not is_dir and not stat.S_ISREG(source_entry.stat().st_mode):
+                # Opening e.g. a named pipe would block until something writes to it
+                self.logger.error("Skipping special file: %s", source_sub_item)
+                continue
+
+            if replica_entry is not None and replica_entry.is_dir() != is_dir:
+                self.logger.debug("Replacing replica item of a different type: %s", replica_sub_item)
+                self._remove(replica_entry, source_sub_item)
+                replica_entry = None
+
+            if is_dir:
+                if replica_entry is None:
+                    self.logger.debug("Directory not found in replica: %s", replica_sub_item)
+                    self.logger.debug("Creating directory: %s", replica_sub_item)
+                    # The parent is the replica directory just scanned, so a single mkdir is enough
+                    os.mkdir(replica_sub_item)
+                subdirs.append((source_sub_item, replica_sub_item))
             else:
-                if not replica_sub_item.exists() or not filecmp.cmp(source_sub_item, replica_sub_item, shallow=False):
-                    self.logger.debug(f"File '{source_sub_item}' differs or is missing in replica.")
-                    self.logger.debug(f"Copying file: {source_sub_item}")
-                    shutil.copy2(source_sub_item, replica_sub_item)
+                if replica_entry is None or not self._files_equal(source_entry, replica_entry):
+                    self.logger.debug("File '%s' differs or is missing in replica.", source_sub_item)
+                    self.logger.debug("Copying file: %s", source_sub_item)
+                    self._copy_file(source_sub_item, replica_sub_item)
+                    self._manifest.pop(replica_sub_item, None)
+                elif replica_entry.stat().st_mtime_ns != source_entry.stat().st_mtime_ns:
+                    # Same content, different timestamps: align them so the next check needs no digest
+                    self.logger.debug("Updating metadata of file: %s", replica_sub_item)
+                    shutil.copystat(source_sub_item, replica_sub_item)
 
         # Remove excess files and directories from replica_path.
         self.logger.info("Removing excess files and directories from replica...")
-        for item in os.listdir(replica_path):
-            source_sub_item = Path(source_path, item)
-            replica_sub_item = Path(replica_path, item)
-
-            self.logger.debug(f"Processing {item}")
-
-            if not source_sub_item.exists():
-                if replica_sub_item.is_dir():
-                    self.logger.debug(f"Directory in replica not found in source: {replica_sub_item}")
-                    self.logger.debug(f"Removing directory: {replica_sub_item}")
-                    shutil.rmtree(replica_sub_item, ignore_errors=True)
-                else:
-                    self.logger.debug(f"File in replica not found in source: {replica_sub_item}")
-                    self.logger.debug(f"Removing file: {replica_sub_item}")
-                    os.remove(replica_sub_item)
+        for item in replica_entries.keys() - source_entries.keys():
+            replica_entry = replica_entries[item]
+
+            self.logger.debug("Processing %s", item)
+            self.logger.debug("Item in replica not found in source: %s", replica_entry.path)
+            self._remove(replica_entry, f"{source_path}{os.sep}{item}")
+
+        return subdirs
+
+    def _remove(self, replica_entry: os.DirEntry, source_path: str) -> None:
+        """
+        Remove a file or directory from the replica.
+
+        The manifest entries of the removed item are dropped, along with those of its source counterpart, which
+        was deleted or replaced by an item of another type. This keeps the manifest from growing with every file
+        that ever existed.
+
+        Args:
+            replica_entry (os.DirEntry): The directory entry of the replica item to remove.
+            source_path (str): The path of the matching item in the source.
+        """
+        self._manifest.pop(replica_entry.path, None)
+        self._manifest.pop(source_path, None)
+
+        if replica_entry.is_dir():
+            self.logger.debug("Removing directory: %s", replica_entry.path)
+            shutil.rmtree(replica_entry.path, ignore_errors=True)
+
+            prefixes = (replica_entry.path + os.sep, source_path + os.sep)
+            for key in list(self._manifest):
+                if key.startswith(prefixes):
+                    self._manifest.pop(key, None)
+        else:
+            self.logger.debug("Removing file: %s", replica_entry.path)
+            os.remove(replica_entry.path)
+
+    @staticmethod
+    def _copy_file(source: str, replica: str) -> None:
+        """
+        Copy a file along with its metadata, like `shutil.copy2`.
+
+        Where available, the data is copied in-kernel with `os.copy_file_range`, which never moves the bytes through
+        user space and lets copy-on-write filesystems share the blocks. If the filesystems do not support it, the
+        data is still copied in-kernel with `os.sendfile`, and otherwise through user space.
+        An in-kernel copy that reports nothing copied for a non-empty file (as on some virtual and network
+        filesystems) is treated as unsupported too.
+
+        Args:
+            source (str): Path to the source file.
+            replica (str): Path to the replica file.
+        """
+        copied = False
+        if hasattr(os, "copy_file_range"):
+            try:
+                with open(source, "rb") as fsrc, open(replica, "wb") as fdst:
+                    _advise_sequential(fsrc.fileno())
+                    offset = 0
+                    while sent := os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30):
+                        offset += sent
+                    copied = _copied_all(fsrc.fileno(), offset)
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED_COPY_ERRNOS:
+                    raise
+
+        if not copied and hasattr(os, "sendfile"):
+            try:
+                with open(source, "rb") as fsrc, open(replica, "wb") as fdst:
+                    _advise_sequential(fsrc.fileno())
+                    offset = 0
+                    while sent := os.sendfile(fdst.fileno(), fsrc.fileno(), offset, 1 << 30):
+                        offset += sent
+                    copied = _copied_all(fsrc.fileno(), offset)
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED_COPY_ERRNOS:
+                    raise
+
+        if not copied:
+            # A plain read/write copy; `shutil.copyfile` could try `os.sendfile` again
+            with open(source, "rb") as fsrc, open(replica, "wb") as fdst:
+                shutil.copyfileobj(fsrc, fdst)
+        shutil.copystat(source, replica)
+
+    def _files_equal(self, source_entry: os.DirEntry, replica_entry: os.DirEntry) -> bool:
+        """
+        Check whether a source file and its replica counterpart hold the same content.
+
+        Files whose size and modification time agree are considered equal without reading them, since
+        `_copy_file` preserves the modification time of copied files. The contents are only compared,
+        by digest, when the metadata differs.
+
+        Args:
+            source_entry (os.DirEntry): The directory entry of the source file.
+            replica_entry (os.DirEntry): The directory entry of the replica file.
+
+        Returns:
+            bool: True if both files are considered identical.
+        """
+        source_stat = source_entry.stat()
+        replica_stat = replica_entry.stat()
+        if source_stat.st_size != replica_stat.st_size:
+            return False
+        if source_stat.st_mtime_ns == replica_stat.st_mtime_ns:
+            return True
+        return self._digest(source_entry.path, source_stat) == self._digest(replica_entry.path, replica_stat)
+
+    def _digest(self, path: str, stat_result: os.stat_result) -> bytes:
+        """
+        Compute the content digest of a file, reusing the manifest entry while the file is unchanged.
+
+        Args:
+            path (str): Path to the file.
+            stat_result (os.stat_result): The current stat of the file.
+
+        Returns:
+            bytes: The BLAKE2b digest of the file content.
+        """
+        key = (stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino)
+        cached = self._manifest.get(path)
+        if cached and cached[:3] == key:
+            return cached[3]
+
+        with open(path, "rb") as f:
+            _advise_sequential(f.fileno())
+            digest = hashlib.file_digest(f, "blake2b").digest()
+        self._manifest[path] = (*key, digest)
+        return digest
+
+    def _load_manifest(self) -> Dict[str, Tuple[int, int, int, bytes]]:
+        """
+        Load the manifest persisted at `manifest_file`.
+
+        Returns:
+            Dict[str, Tuple[int, int, int, bytes]]: The manifest, mapping file paths to their
+                (size, mtime_ns, inode, digest). Empty if there is no usable persisted manifest.
+        """
+        if not self.manifest_file or not self.manifest_file.exists():
+            return {}
+
+        try:
+            with open(self.manifest_file, encoding="utf8") as f:
+                persisted = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.error("Ignoring unreadable manifest '%s': %s", self.manifest_file, e)
+            return {}
+
+        if not isinstance(persisted, dict):
+            self.logger.error("Ignoring invalid manifest '%s': %s", self.manifest_file, type(persisted).__name__)
+            return {}
+
+        # Keep only well-formed entries, so a damaged manifest cannot break later synchronizations
+        manifest = {}
+        for path, entry in persisted.items():
+            try:
+                size, mtime_ns, ino, digest = entry
+                if type(size) is type(mtime_ns) is type(ino) is int:
+                    manifest[path] = (size, mtime_ns, ino, bytes.fromhex(digest))
+            except (TypeError, ValueError):
+                pass
+        if len(manifest) < len(persisted):
+            self.logger.error(
+                "Ignoring %s invalid entries of manifest: %s", len(persisted) - len(manifest), self.manifest_file
+            )
+
+        self.logger.info("Loaded manifest with %s entries from: %s", len(manifest), self.manifest_file)
+        return manifest
+
+    def save_manifest(self) -> None:
+        """
+        Persist the manifest to `manifest_file`, so that a later run can reuse it.
+
+        Does nothing if no `manifest_file` was given.
+        """
+        if not self.manifest_file:
+            return
+
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        # Plain JSON, with hexadecimal digests, so loading a manifest never executes code
+        with open(self.manifest_file, "w", encoding="utf8") as f:
+            json.dump({path: [*entry[:3], entry[3].hex()] for path, entry in self._manifest.items()}, f)
+        self.logger.info("Saved manifest with %s entries to: %s", len(self._manifest), self.manifest_file)
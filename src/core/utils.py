@@ -1,8 +1,12 @@
-from core.cli import ArgumentsModel
+from typing import TYPE_CHECKING
+
 from core.logger import MainLogger
 
+if TYPE_CHECKING:
+    from core.models import ArgumentsModel
+
 
-def setup_parent_dirs(cli_arguments: ArgumentsModel, logger: MainLogger):
+def setup_parent_dirs(cli_arguments: "ArgumentsModel", logger: MainLogger):
     """
     Ensure the parent directories for the replica directory exist and set permissions for source and replica.
 
@@ -17,14 +21,13 @@ def setup_parent_dirs(cli_arguments: ArgumentsModel, logger: MainLogger):
     source = cli_arguments.source
     replica = cli_arguments.replica
 
-    # Create parent directories for replica if they do not exist
-    if not replica.exists():
-        logger.debug("Creating parent directories for replica.")
-        replica.mkdir(parents=True, exist_ok=True)
-
-    # Update permissions for source and replica directories
-    logger.debug("Updating read/write permissions for source.")
-    cli_arguments.update_permissions(source)
+    # Create parent directories for replica if they do not exist, without checking for them first
+    try:
+        replica.mkdir(parents=True)
+        logger.debug("Created parent directories for replica.")
+    except FileExistsError:
+        pass
 
-    logger.debug("Updating read/write permissions for replica.")
-    cli_arguments.update_permissions(replica)
+    # Update permissions for source and replica directories in a single pass
+    logger.debug("Updating read/write permissions for source and replica.")
+    cli_arguments.update_permissions(source, replica)
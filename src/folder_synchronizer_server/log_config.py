@@ -1,8 +1,21 @@
 from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Union
 
 
-@lru_cache
-def log_config():
+@lru_cache(maxsize=4)
+def log_config(log_file: Union[str, Path] = "logfile.log") -> Dict[str, Any]:
+    """
+    Build the logging configuration passed to `uvicorn`, writing to the given log file.
+
+    The configuration is cached per log file and shared between callers, so it must not be mutated.
+
+    Args:
+        log_file (Union[str, Path], optional): Path to the rotating log file. Defaults to "logfile.log".
+
+    Returns:
+        Dict[str, Any]: The `logging.config.dictConfig` compatible configuration.
+    """
     return {
         "version": 1,
         "disable_existing_loggers": False,
@@ -16,7 +29,7 @@ def log_config():
             "logfile": {
                 "class": "logging.handlers.RotatingFileHandler",
                 "formatter": "default",
-                "filename": "logfile.log",
+                "filename": str(log_file),
                 "mode": "a",
                 "maxBytes": 1048576,
                 "backupCount": 3,
@@ -1,13 +1,16 @@
+import gc
 from datetime import datetime
 from typing import Dict
 
-import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
 from core.utils import setup_parent_dirs
-from core.cli import ArgumentsModel, arguments_parser
+from core.cli import arguments_parser
+from core.models import ArgumentsModel
 from core.logger import MainLogger
 from core.synchronizer import FolderSynchronizer
 from folder_synchronizer_server.log_config import log_config
@@ -16,6 +19,12 @@ from folder_synchronizer_server.log_config import log_config
 args_model = arguments_parser()
 logger = MainLogger("server_main", log_file=args_model.log_file, overwrite=True)
 
+# Shared across sync jobs so its manifest is reused between runs
+folder_synchronizer = FolderSynchronizer(logger=logger, manifest_file=args_model.log_file.with_name("manifest.json"))
+
+# Built once and reused to validate JSON request bodies directly
+args_adapter = TypeAdapter(ArgumentsModel)
+
 app = FastAPI()
 scheduler = BackgroundScheduler()
 sync_count = 0
@@ -25,11 +34,10 @@ def scheduled_sync():
     """
     Executes the synchronization task using the current configuration in `args_model`.
 
-    This function initializes the `FolderSynchronizer` with the global logger and
-    performs the synchronization between the source and replica folders as specified
-    in `args_model`.
+    This function uses the global `folder_synchronizer` to perform the synchronization
+    between the source and replica folders as specified in `args_model`.
 
-    - Uses the `FolderSynchronizer` class to handle the synchronization logic.
+    - Uses the shared `FolderSynchronizer` instance to handle the synchronization logic.
     - Accesses global `args_model` to get the source and replica paths.
     - Logs messages according to the configured logging settings.
     """
@@ -38,9 +46,6 @@ def scheduled_sync():
 
     sync_count += 1
 
-    # Initialize the folder synchronizer with the global logger
-    folder_synchronizer = FolderSynchronizer(logger=logger)
-
     # Perform synchronization between source and replica directories
     folder_synchronizer.sync_folders(args_model.source, args_model.replica)
 
@@ -78,6 +83,21 @@ async def startup_event():
     scheduler.start()
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    FastAPI shutdown event handler to stop background tasks.
+
+    Stops the scheduler, waiting for a running synchronization to finish, persists
+    the synchronizer manifest so the next start can skip re-reading unchanged files,
+    and shuts down the synchronizer's thread pool.
+    """
+    if scheduler.running:
+        scheduler.shutdown()
+    folder_synchronizer.save_manifest()
+    folder_synchronizer.close()
+
+
 @app.get("/", summary="Retrieve synchronization count and CLI arguments")
 def root():
     """
@@ -124,25 +144,43 @@ def get_sync_params() -> ArgumentsModel:
     return args_model
 
 
-@app.post("/update_sync_params/")
-def update_sync_params(args: ArgumentsModel) -> Dict:
+@app.post(
+    "/update_sync_params/",
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": args_adapter.json_schema()}},
+            "required": True,
+        }
+    },
+)
+async def update_sync_params(request: Request) -> Dict:
     """
     Update synchronization parameters and reschedule the synchronization job.
 
     This endpoint updates the synchronization parameters (source, replica, interval,
     log_file) and reschedules the synchronization job with the new interval.
 
+    The JSON body is validated straight into an `ArgumentsModel`, without decoding it
+    to a dictionary first.
+
     Args:
-        args (ArgumentsModel): The new synchronization parameters.
+        request (Request): The request, whose body holds the new synchronization parameters.
 
     Returns:
         dict: A message indicating that the synchronization parameters were updated.
 
     Raises:
+        RequestValidationError: If the body is not valid synchronization parameters.
         HTTPException: If the scheduler is not running.
     """
     global args_model
-    args_model = args
+
+    try:
+        args_model = args_adapter.validate_json(await request.body())
+    except ValidationError as e:
+        # Same error shape as FastAPI's own body validation
+        errors = e.errors(include_url=False)
+        raise RequestValidationError([{**error, "loc": ("body", *error["loc"])} for error in errors])
 
     if not scheduler.running:
         raise HTTPException(status_code=500, detail="Scheduler is not running.")
@@ -160,31 +198,38 @@ def update_sync_params(args: ArgumentsModel) -> Dict:
     return {"message": "Synchronization parameters updated"}
 
 
-if __name__ == "__main__":
+def run_server() -> None:
+    """
+    Main entry point for the folder synchronization REST API server.
+
+    Prepares the source and replica folders from the parsed command-line arguments and serves
+    the FastAPI app with `uvicorn`, whose startup event schedules the synchronization job.
+
+    `uvicorn` is only imported here, so importing the app (e.g. in tests) does not pay for it.
+    For periodic synchronization without the HTTP API, use `folder_synchronizer_simple` instead.
+    """
+    import uvicorn
+
     source = args_model.source
     replica = args_model.replica
     log_file = args_model.log_file
-    INTERVAL = args_model.interval
+    interval = args_model.interval
 
     # Instantiate the logger
-    logger.info(f"Parsed arguments:  {args_model}")
+    logger.info("Parsed arguments:  %s", args_model)
 
     # Setup parent directories
     logger.info("Setting-up parent directories ...")
     setup_parent_dirs(args_model, logger)
 
-    logger.info(f"Starting synchronization: {source} -> {replica} every {INTERVAL} seconds")
+    logger.info("Starting synchronization: %s -> %s every %s seconds", source, replica, interval)
 
-    # Dynamically update the log file name in the log configuration.
-    log_config()["handlers"].update(
-        {
-            "logfile": {
-                "class": "logging.handlers.RotatingFileHandler",
-                "formatter": "default",
-                "filename": log_file,
-                "mode": "a",
-                "maxBytes": 1048576,
-            }
-        }
-    )
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_config=log_config())
+    # Move the objects alive after startup out of the collector's reach, so collections while serving
+    # only scan what requests and synchronizations allocate
+    gc.freeze()
+
+    uvicorn.run(app, host="0.0.0.0", port=8000, log_config=log_config(log_file))
+
+
+if __name__ == "__main__":
+    run_server()
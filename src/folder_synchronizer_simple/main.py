@@ -1,9 +1,80 @@
+import gc
+import os
+import threading
 import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
 
-from core.cli import arguments_parser
-from core.logger import MainLogger
-from core.synchronizer import FolderSynchronizer
-from core.utils import setup_parent_dirs
+from core.cli import simple_arguments_parser
+
+if TYPE_CHECKING:
+    from core.logger import MainLogger
+
+
+def watch_source(source: Path, logger: "MainLogger") -> Optional[threading.Event]:
+    """
+    Watch the source folder for changes using `watchdog` (inotify, FSEvents, ...).
+
+    Args:
+        source (Path): Path to the source folder to watch recursively.
+        logger (MainLogger): Logger instance to record the watching mode.
+
+    Returns:
+        Optional[threading.Event]: An event set whenever something changes in the source folder, or None if
+            file system events are unavailable (`watchdog` not installed, or the watch could not be started).
+    """
+    try:
+        from watchdog.events import FileSystemEvent, FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        logger.info("watchdog is not installed; polling the source folder at every interval.")
+        return None
+
+    changed = threading.Event()
+
+    class SourceChangeHandler(FileSystemEventHandler):
+        def on_any_event(self, event: FileSystemEvent) -> None:
+            # Reads of the source, e.g. by the synchronizer itself, are not changes
+            if event.event_type not in ("opened", "closed_no_write"):
+                changed.set()
+
+    observer = Observer()
+    observer.daemon = True
+    try:
+        observer.schedule(SourceChangeHandler(), str(source), recursive=True)
+        observer.start()
+    except OSError as e:
+        logger.error("Could not watch the source folder (%s); polling it at every interval.", e)
+        return None
+
+    logger.info("Watching the source folder for changes.")
+    return changed
+
+
+def wait_for_next_sync(
+    last_start: float, interval: int, changed: Optional[threading.Event], full_sync_interval: int
+) -> None:
+    """
+    Block until the next synchronization is due.
+
+    Synchronizations start every `interval` seconds, counted from the start of the previous one so the sync duration
+    does not stretch the interval. When the source folder is watched, the next synchronization additionally waits for
+    a change in the source, but no longer than `full_sync_interval` seconds after the previous one started, to repair
+    changes made to the replica and source changes whose events were missed. Changes within an interval are
+    coalesced into a single synchronization.
+
+    Args:
+        last_start (float): The `time.monotonic()` at which the previous synchronization started.
+        interval (int): The minimum number of seconds between synchronizations.
+        changed (Optional[threading.Event]): The event set on source changes, or None when polling.
+        full_sync_interval (int): The maximum number of seconds between synchronizations while watching.
+    """
+    sleep_for = last_start + interval - time.monotonic()
+    if sleep_for > 0:
+        time.sleep(sleep_for)
+
+    if changed:
+        changed.wait(timeout=max(last_start + full_sync_interval - time.monotonic(), 0))
 
 
 def main() -> None:
@@ -15,6 +86,9 @@ def main() -> None:
     - The path to the source folder that will be synchronized.
     - The path to the replica folder that will be updated.
     - The interval, in seconds, at which the synchronization should occur.
+    - Whether to poll the source folder instead of waiting for file system events.
+    - The number of threads synchronizing directories concurrently.
+    - The maximum interval, in seconds, between synchronizations while waiting for file system events.
     - The path to the log file where synchronization activities will be recorded.
 
     The function performs the following steps:
@@ -25,6 +99,10 @@ def main() -> None:
     3. Logs an informational message indicating the start of synchronization, including the source and replica
         paths and the synchronization interval.
     4. Prints the parsed arguments to the console for user confirmation.
+    5. Synchronizes the folders with a single `FolderSynchronizer`, whose manifest is saved next to the log file
+        when the loop stops. When the source folder can be watched, a synchronization runs at most every `interval`
+        seconds and only after something changed in the source, or after `full_sync_interval` seconds without
+        changes; otherwise it runs every `interval` seconds.
 
     Example usage:
         >> python script.py /path/to/source /path/to/replica 60 /path/to/logfile.log
@@ -33,7 +111,12 @@ def main() -> None:
     """
 
     # Grab cli arguments
-    args_model = arguments_parser()
+    args_model, options = simple_arguments_parser()
+
+    # Imported once the arguments are known to be valid, so `--help` and usage errors return quickly
+    from core.logger import MainLogger
+    from core.synchronizer import FolderSynchronizer
+    from core.utils import setup_parent_dirs
 
     source = args_model.source
     replica = args_model.replica
@@ -42,18 +125,40 @@ def main() -> None:
 
     # Instantiate the logger
     logger = MainLogger("simple_main", log_file=log_file, overwrite=True)
-    logger.info(f"Parsed arguments:  {args_model}")
+    logger.info("Parsed arguments:  %s %s", args_model, options)
 
     # Setup parent directories
     logger.info("Setting-up parent directories ...")
     setup_parent_dirs(args_model, logger)
 
-    logger.info(f"Starting synchronization: {source} -> {replica} every {interval} seconds")
-
-    while True:
-        folder_synchronizer = FolderSynchronizer(logger=logger)
-        folder_synchronizer.sync_folders(source, replica)
-        time.sleep(interval)
+    logger.info("Starting synchronization: %s -> %s every %s seconds", source, replica, interval)
+
+    # A single synchronizer lives across all ticks so its manifest is reused
+    folder_synchronizer = FolderSynchronizer(
+        logger=logger, manifest_file=log_file.with_name("manifest.json"), workers=options.workers
+    )
+
+    # Unless polling is forced (e.g. network file systems without change events), wait for source changes
+    changed = None if options.poll else watch_source(source, logger)
+
+    # Move the objects alive after startup out of the collector's reach, so collections during the
+    # long-running loop only scan what each synchronization allocates
+    gc.freeze()
+
+    # Converted once rather than on every tick
+    source_str, replica_str = os.fspath(source), os.fspath(replica)
+
+    try:
+        while True:
+            start = time.monotonic()
+            if changed:
+                changed.clear()
+            folder_synchronizer.sync_folders(source_str, replica_str)
+            wait_for_next_sync(start, interval, changed, options.full_sync_interval)
+    finally:
+        # Wait for the pool threads still updating the manifest (e.g. after Ctrl+C) before saving it
+        folder_synchronizer.close()
+        folder_synchronizer.save_manifest()
 
 
 if __name__ == "__main__":
@@ -8,7 +8,8 @@ from pathlib import Path
 
 from pydantic import ValidationError
 
-from core.cli import ArgumentsModel  # Replace with actual import path
+from core.cli import _PARSER, _SIMPLE_PARSER
+from core.models import ArgumentsModel
 
 
 class TestArgumentsModel(unittest.TestCase):
@@ -67,6 +68,69 @@ class TestArgumentsModel(unittest.TestCase):
                     file_path = os.path.join(root, f)
                     self.assertTrue(os.access(file_path, os.R_OK | os.W_OK))
 
+    def test_update_permissions_skips_compliant(self):
+        """Only files and dirs with different permissions are updated"""
+        # Prepare
+        dir_mode = stat.S_IRWXU | stat.S_IRWXG | stat.S_IROTH | stat.S_IXOTH
+        file_mode = stat.S_IRUSR | stat.S_IWUSR | stat.S_IRGRP | stat.S_IROTH
+        compliant_dir = self.source_path / "compliant"
+        compliant_dir.mkdir(exist_ok=True)
+        os.chmod(compliant_dir, dir_mode)
+        compliant_file = compliant_dir / "compliant.txt"
+        compliant_file.write_text("This is a test file.", encoding="utf8")
+        os.chmod(compliant_file, file_mode)
+        outdated_file = compliant_dir / "outdated.txt"
+        outdated_file.write_text("This is a test file.", encoding="utf8")
+        os.chmod(outdated_file, stat.S_IRUSR | stat.S_IWUSR)
+
+        # Act
+        with patch("os.chmod") as mock_chmod:
+            ArgumentsModel.update_permissions(self.source_path)
+
+        # Assert
+        mock_chmod.assert_has_calls([call(str(outdated_file), file_mode)])
+        self.assertNotIn(call(str(compliant_dir), dir_mode), mock_chmod.call_args_list)
+        self.assertNotIn(call(str(compliant_file), file_mode), mock_chmod.call_args_list)
+
+    def test_update_permissions_multiple_paths(self):
+        """Files shared by several paths are updated once"""
+        # Prepare
+        file_mode = stat.S_IRUSR | stat.S_IWUSR | stat.S_IRGRP | stat.S_IROTH
+        self.replica_path.mkdir(parents=True, exist_ok=True)
+        source_file = self.source_path / "shared.txt"
+        source_file.write_text("This is a test file.", encoding="utf8")
+        os.chmod(source_file, stat.S_IRUSR | stat.S_IWUSR)
+        replica_file = self.replica_path / "shared.txt"
+        replica_file.unlink(missing_ok=True)
+        os.link(source_file, replica_file)
+
+        # Act
+        with patch("os.chmod") as mock_chmod:
+            ArgumentsModel.update_permissions(self.source_path, self.replica_path)
+
+        # Assert
+        shared_calls = [c for c in mock_chmod.call_args_list if c.args[0] in (str(source_file), str(replica_file))]
+        self.assertEqual(shared_calls, [call(shared_calls[0].args[0], file_mode)])
+
+
+    def test_update_permissions_w_dir_symlinks(self):
+        """Directories reached through a symlink first are still walked"""
+        # Prepare
+        file_mode = stat.S_IRUSR | stat.S_IWUSR | stat.S_IRGRP | stat.S_IROTH
+        root = self.test_root / "symlinks"
+        for name in ("a", "m", "z"):
+            Path(root, name).mkdir(parents=True, exist_ok=True)
+            Path(root, name, "f.txt").write_text("This is a test file.", encoding="utf8")
+            os.chmod(Path(root, name, "f.txt"), stat.S_IRUSR | stat.S_IWUSR)
+            Path(root, f"link_{name}").symlink_to(Path(root, name), target_is_directory=True)
+
+        # Act
+        ArgumentsModel.update_permissions(root)
+
+        # Assert
+        for name in ("a", "m", "z"):
+            self.assertEqual(stat.S_IMODE(Path(root, name, "f.txt").stat().st_mode), file_mode)
+
 
 # VALIDATION CHECKS
 class TestArgumentsModelValidation:
@@ -86,8 +150,11 @@ class TestArgumentsModelValidation:
 
             # TestCase4: interval not a vaid positive
             ({"interval": -1}, ValidationError),
+
+            # TestCase5: option of the simple script only, with otherwise valid arguments
+            ({"source": Path("/"), "workers": 2}, ValidationError),
         ],
-        ids=["TestCase1", "TestCase2", "TestCase3", "TestCase4"],
+        ids=["TestCase1", "TestCase2", "TestCase3", "TestCase4", "TestCase5"],
     )
     def test_invalid_paths(self, cli_vars: dict, error_type: Exception):
         """Given dir paths do not exist"""
@@ -95,3 +162,76 @@ class TestArgumentsModelValidation:
         # Act, Assert
         with pytest.raises(error_type):
             ArgumentsModel(**cli_vars)
+
+
+class TestArgumentsParser:
+    """For cli args parsing"""
+
+    def test_parse_defaults(self):
+        """Only source given, assert defaults"""
+        # Act
+        args = _PARSER.parse_args(["/path/to/source"])
+
+        # Assert
+        assert vars(args) == {
+            "source": "/path/to/source",
+            "replica": None,
+            "interval": 60,
+            "log_file": None,
+        }
+
+    def test_parse_simple_only_arguments(self):
+        """Options of the simple script are rejected"""
+        # Act, Assert
+        with pytest.raises(SystemExit):
+            _PARSER.parse_args(["/path/to/source", "--workers", "2"])
+
+    def test_parse_simple_defaults(self):
+        """Only source given to the simple script, assert defaults"""
+        # Act
+        args = _SIMPLE_PARSER.parse_args(["/path/to/source"])
+
+        # Assert
+        assert vars(args) == {
+            "source": "/path/to/source",
+            "replica": None,
+            "interval": 60,
+            "log_file": None,
+            "poll": False,
+            "workers": None,
+            "full_sync_interval": 3600,
+        }
+
+    def test_parse_all_arguments(self):
+        """All arguments given to the simple script"""
+        # Act
+        args = _SIMPLE_PARSER.parse_args(
+            [
+                "/path/to/source",
+                "--replica",
+                "/path/to/replica",
+                "--interval",
+                "5",
+                "--log_file",
+                "/log",
+                "--poll",
+                "--workers",
+                "2",
+                "--full_sync_interval",
+                "300",
+            ]
+        )
+
+        # Assert
+        assert args.replica == "/path/to/replica"
+        assert args.interval == 5
+        assert args.log_file == "/log"
+        assert args.poll
+        assert args.workers == 2
+        assert args.full_sync_interval == 300
+
+    def test_parse_invalid_workers(self):
+        """Workers not a valid positive"""
+        # Act, Assert
+        with pytest.raises(SystemExit):
+            _SIMPLE_PARSER.parse_args(["/path/to/source", "--workers", "0"])
@@ -1,47 +1,41 @@
-import unittest
-import filecmp
+import errno
+import hashlib
+from collections import deque
 from unittest.mock import patch, MagicMock
 from pathlib import Path
-import shutil
 import os
+import json
+import threading
+import time
 import pytest
 
-from core.cli import ArgumentsModel
 from core.logger import MainLogger
 from core.synchronizer import FolderSynchronizer
+from folder_synchronizer_simple.main import wait_for_next_sync
 
 
-class TestFolderSynchronizerSimple(unittest.TestCase):
-    @classmethod
-    def setUpClass(cls):
-        # Define paths for the test
-        cls.root_folder = Path(os.getcwd(), "tests", "resources")
-        cls.source_path = Path(cls.root_folder, "source")
+class TestFolderSynchronizerSimple:
+    @pytest.fixture(autouse=True)
+    def resources(self, tmp_path):
+        # Define paths for the test, under a per-test directory reclaimed by pytest
+        self.root_folder = tmp_path
+        self.source_path = Path(self.root_folder, "source")
 
-        output_path = Path(cls.root_folder, "output")
-        cls.replica_path = Path(output_path, "replica")
-        cls.log_file_path = Path(output_path, "logfile.log")
+        output_path = Path(self.root_folder, "output")
+        self.replica_path = Path(output_path, "replica")
+        self.log_file_path = Path(output_path, "logfile.log")
 
-    def setUp(self):
         # Create source resource
-        os.makedirs(self.source_path, exist_ok=True)
-        os.makedirs(self.replica_path, exist_ok=True)
-
-    def tearDown(self):
-        shutil.rmtree(self.source_path, ignore_errors=True)
-        shutil.rmtree(self.replica_path, ignore_errors=True)
-
-    @classmethod
-    def tearDownClass(cls):
-        shutil.rmtree(cls.root_folder, ignore_errors=True)
+        os.makedirs(self.source_path)
+        os.makedirs(self.replica_path)
 
     def is_dirs_identical(self, source_path: str, replica_path: str):
         """
-        Recursively compare two directories to check if they are identical.
+        Compare two directory trees to check if they are identical.
 
-        This method compares two directories and their contents recursively
-        to determine if they are identical. It checks for the presence of
-        files and directories, as well as the contents of files.
+        This method walks both trees breadth-first to determine if they are
+        identical. It checks for the presence of files and directories, as
+        well as the contents of files.
 
         Args:
             source_path (str): Path to the source directory.
@@ -50,40 +44,81 @@ class TestFolderSynchronizerSimple(unittest.TestCase):
         Returns:
             bool: True if both dirs are identical
         """
-        dir_comparison = filecmp.dircmp(source_path, replica_path)
-
-        # Check if there are any files or directories only in one of the directories.
-        if dir_comparison.left_only or dir_comparison.right_only or dir_comparison.funny_files:
-            return False
-
-        # Compare files in both directories.
-        _, mismatch, errors = filecmp.cmpfiles(source_path, replica_path, dir_comparison.common_files, shallow=False)
-        if mismatch or errors:
-            return False
-
-        # Recursively compare subdirectories.
-        for common_dir in dir_comparison.common_dirs:
-            new_source_path = os.path.join(source_path, common_dir)
-            new_replica_path = os.path.join(replica_path, common_dir)
-            if not self.is_dirs_identical(new_source_path, new_replica_path):
+        pending = deque([(source_path, replica_path)])
+        while pending:
+            source_dir, replica_dir = pending.popleft()
+            source_entries = self._snapshot(source_dir)
+            replica_entries = self._snapshot(replica_dir)
+
+            # Check if there are any files or directories only in one of the directories.
+            if source_entries.keys() != replica_entries.keys():
                 return False
 
+            for name, (source_entry_path, is_dir, size) in source_entries.items():
+                replica_entry_path, replica_is_dir, replica_size = replica_entries[name]
+                if is_dir != replica_is_dir:
+                    return False
+
+                # Compare subdirectories on a later iteration.
+                if is_dir:
+                    pending.append((source_entry_path, replica_entry_path))
+
+                # Compare files, reading them only when their sizes match.
+                elif size != replica_size or not self._files_identical(source_entry_path, replica_entry_path, size):
+                    return False
+
         return True
 
+    @staticmethod
+    def _files_identical(source_path: str, replica_path: str, size: int) -> bool:
+        """
+        Compare the content of two files of the same size.
+
+        Small files are compared directly in memory; larger ones by their BLAKE2b digests, computed in C.
+
+        Args:
+            source_path (str): Path to the source file.
+            replica_path (str): Path to the replica file.
+            size (int): Size of both files.
+
+        Returns:
+            bool: True if both files have the same content.
+        """
+        if size < 2 * 1024 * 1024:
+            return Path(source_path).read_bytes() == Path(replica_path).read_bytes()
+
+        with open(source_path, "rb") as source_file, open(replica_path, "rb") as replica_file:
+            return (
+                hashlib.file_digest(source_file, "blake2b").digest()
+                == hashlib.file_digest(replica_file, "blake2b").digest()
+            )
+
+    @staticmethod
+    def _snapshot(path: str) -> dict:
+        """
+        List a directory in a single scan.
+
+        Args:
+            path (str): Path to the directory.
+
+        Returns:
+            dict: Maps each entry name to its (path, is_dir, size), taken from `os.DirEntry`.
+        """
+        with os.scandir(path) as it:
+            return {
+                entry.name: (entry.path, entry.is_dir(follow_symlinks=False), entry.stat(follow_symlinks=False).st_size)
+                for entry in it
+            }
+
     def test_sync_folders_end2end_source_w_files(self):
         """Source with only files."""
         # Prepare
         Path(self.source_path, "file1.txt").write_text("This is a test file.", encoding="utf8")
         Path(self.source_path, "file2.txt").write_text("This is another test file.", encoding="utf8")
 
-        args_model = ArgumentsModel(
-            source=self.source_path,
-            replica=self.replica_path,
-        )
-
         # Act
-        synchronizer = FolderSynchronizer()
-        synchronizer.sync_folders(args_model.source, args_model.replica)
+        with FolderSynchronizer() as synchronizer:
+            synchronizer.sync_folders(self.source_path, self.replica_path)
 
         # Assert
         assert self.is_dirs_identical(self.source_path, self.replica_path)
@@ -96,14 +131,9 @@ class TestFolderSynchronizerSimple(unittest.TestCase):
         Path(self.source_path, "subdir1", "subsubdir1").mkdir(parents=True, exist_ok=True)
         Path(self.source_path, "subdir2", "subsubdir2", "subsubsubdir1").mkdir(parents=True, exist_ok=True)
 
-        args_model = ArgumentsModel(
-            source=self.source_path,
-            replica=self.replica_path,
-        )
-
         # Act
-        synchronizer = FolderSynchronizer()
-        synchronizer.sync_folders(args_model.source, args_model.replica)
+        with FolderSynchronizer() as synchronizer:
+            synchronizer.sync_folders(self.source_path, self.replica_path)
 
         # Assert
         assert self.is_dirs_identical(self.source_path, self.replica_path)
@@ -115,14 +145,21 @@ class TestFolderSynchronizerSimple(unittest.TestCase):
         Path(self.source_path, "subdir1", "subdir2").mkdir(parents=True, exist_ok=True)
         Path(self.source_path, "subdir1", "subdir2", "file2.txt").write_text("This is a test file.", encoding="utf8")
 
-        args_model = ArgumentsModel(
-            source=self.source_path,
-            replica=self.replica_path,
-        )
+        # Act
+        with FolderSynchronizer() as synchronizer:
+            synchronizer.sync_folders(self.source_path, self.replica_path)
+
+        # Assert
+        assert self.is_dirs_identical(self.source_path, self.replica_path)
+
+    def test_sync_folders_end2end_source_w_large_file(self):
+        """Source with a file larger than the in-memory comparison threshold"""
+        # Prepare
+        Path(self.source_path, "large.bin").write_bytes(os.urandom(3 * 1024 * 1024))
 
         # Act
-        synchronizer = FolderSynchronizer()
-        synchronizer.sync_folders(args_model.source, args_model.replica)
+        with FolderSynchronizer() as synchronizer:
+            synchronizer.sync_folders(self.source_path, self.replica_path)
 
         # Assert
         assert self.is_dirs_identical(self.source_path, self.replica_path)
@@ -137,14 +174,240 @@ class TestFolderSynchronizerSimple(unittest.TestCase):
         Path(self.replica_path, "dir3").mkdir(parents=True, exist_ok=True)
         Path(self.replica_path, "dir3", "file3.txt").write_text("This is another test file1.", encoding="utf8")
 
-        args_model = ArgumentsModel(
-            source=self.source_path,
-            replica=self.replica_path,
+        # Act
+        with FolderSynchronizer() as synchronizer:
+            synchronizer.sync_folders(self.source_path, self.replica_path)
+
+        # Assert
+        assert self.is_dirs_identical(self.source_path, self.replica_path)
+
+    def test_sync_folders_end2end_w_modified_source(self):
+        """Source files modified after a sync. Update replica"""
+        # Prepare
+        Path(self.source_path, "file1.txt").write_text("This is a test file.", encoding="utf8")
+        Path(self.source_path, "dir1").mkdir(parents=True, exist_ok=True)
+        Path(self.replica_path, "dir1").write_text("This is a file in place of a dir.", encoding="utf8")
+
+        with FolderSynchronizer() as synchronizer:
+            synchronizer.sync_folders(self.source_path, self.replica_path)
+
+            # Same size, different content and modification time
+            Path(self.source_path, "file1.txt").write_text("This is a new file!.", encoding="utf8")
+            os.utime(Path(self.source_path, "file1.txt"), ns=(0, 0))
+
+            # Act
+            synchronizer.sync_folders(self.source_path, self.replica_path)
+
+        # Assert
+        assert self.is_dirs_identical(self.source_path, self.replica_path)
+
+    def test_sync_folders_manifest_persistence(self):
+        """Manifest saved by one synchronizer is reloaded by the next"""
+        # Prepare
+        manifest_file = Path(self.root_folder, "output", "manifest.json")
+        Path(self.source_path, "file1.txt").write_text("This is a test file.", encoding="utf8")
+        Path(self.replica_path, "file1.txt").write_text("This is a test file.", encoding="utf8")
+        os.utime(Path(self.replica_path, "file1.txt"), ns=(0, 0))
+
+        with FolderSynchronizer(manifest_file=manifest_file) as synchronizer:
+            synchronizer.sync_folders(self.source_path, self.replica_path)
+
+        # Act
+        synchronizer.save_manifest()
+        reloaded_synchronizer = FolderSynchronizer(manifest_file=manifest_file)
+        reloaded_synchronizer.close()
+
+        # Assert
+        assert str(Path(self.source_path, "file1.txt")) in reloaded_synchronizer._manifest
+        assert str(Path(self.replica_path, "file1.txt")) in reloaded_synchronizer._manifest
+        assert self.is_dirs_identical(self.source_path, self.replica_path)
+
+    def test_sync_folders_manifest_drops_deleted_source(self):
+        """Manifest entries of deleted source files and directories are dropped"""
+        # Prepare
+        Path(self.source_path, "subdir1").mkdir()
+        for file_path in (Path("file1.txt"), Path("subdir1", "file2.txt")):
+            Path(self.source_path, file_path).write_text("This is a test file.", encoding="utf8")
+            Path(self.replica_path, file_path.parent).mkdir(exist_ok=True)
+            Path(self.replica_path, file_path).write_text("This is a test file.", encoding="utf8")
+            os.utime(Path(self.replica_path, file_path), ns=(0, 0))
+
+        with FolderSynchronizer() as synchronizer:
+            synchronizer.sync_folders(self.source_path, self.replica_path)
+            manifest_size = len(synchronizer._manifest)
+
+            # Act
+            Path(self.source_path, "file1.txt").unlink()
+            Path(self.source_path, "subdir1", "file2.txt").unlink()
+            Path(self.source_path, "subdir1").rmdir()
+            synchronizer.sync_folders(self.source_path, self.replica_path)
+
+        # Assert
+        assert manifest_size == 4
+        assert synchronizer._manifest == {}
+        assert self.is_dirs_identical(self.source_path, self.replica_path)
+
+    def test_sync_folders_invalid_manifest(self):
+        """Manifest file not holding a manifest is ignored"""
+        # Prepare
+        manifest_file = Path(self.root_folder, "manifest.json")
+        manifest_file.write_text(json.dumps(["not", "a", "manifest"]), encoding="utf8")
+
+        # Act
+        with FolderSynchronizer(manifest_file=manifest_file) as synchronizer:
+            synchronizer.sync_folders(self.source_path, self.replica_path)
+
+        # Assert
+        assert synchronizer._manifest == {}
+
+    def test_sync_folders_invalid_manifest_entries(self):
+        """Invalid manifest entries are dropped, valid ones kept"""
+        # Prepare
+        manifest_file = Path(self.root_folder, "manifest.json")
+        valid_entry = [20, 0, 1, "ab"]
+        manifest_file.write_text(
+            json.dumps(
+                {
+                    "/valid": valid_entry,
+                    "/int": 5,
+                    "/short": [20, 0, 1],
+                    "/bool": [True, 0, 1, "ab"],
+                    "/digest": [20, 0, 1, "not hex"],
+                }
+            ),
+            encoding="utf8",
         )
+        Path(self.source_path, "file1.txt").write_text("This is a test file.", encoding="utf8")
+
+        # Act
+        with FolderSynchronizer(manifest_file=manifest_file) as synchronizer:
+            synchronizer.sync_folders(self.source_path, self.replica_path)
+
+        # Assert
+        assert synchronizer._manifest == {"/valid": (20, 0, 1, b"\xab")}
+        assert self.is_dirs_identical(self.source_path, self.replica_path)
+
+    def test_sync_folders_end2end_wo_copy_file_range(self):
+        """Copies fall back when the filesystems do not support copy_file_range"""
+        # Prepare
+        Path(self.source_path, "file1.txt").write_text("This is a test file.", encoding="utf8")
+        Path(self.source_path, "subdir1").mkdir(parents=True, exist_ok=True)
+        Path(self.source_path, "subdir1", "file2.txt").write_text("This is another test file.", encoding="utf8")
+
+        # Act
+        copy_file_range_error = OSError(errno.EXDEV, "Invalid cross-device link")
+        with FolderSynchronizer() as synchronizer:
+            with patch("os.copy_file_range", side_effect=copy_file_range_error, create=True):
+                synchronizer.sync_folders(self.source_path, self.replica_path)
+
+        # Assert
+        assert self.is_dirs_identical(self.source_path, self.replica_path)
+
+    def test_sync_folders_end2end_w_no_op_copy(self):
+        """Copies fall back when in-kernel copies report end of file without copying anything"""
+        # Prepare
+        Path(self.source_path, "file1.txt").write_text("This is a test file.", encoding="utf8")
+        Path(self.source_path, "empty.txt").touch()
 
         # Act
-        synchronizer = FolderSynchronizer()
-        synchronizer.sync_folders(args_model.source, args_model.replica)
+        with FolderSynchronizer() as synchronizer:
+            with patch("os.copy_file_range", return_value=0, create=True), patch("os.sendfile", return_value=0):
+                synchronizer.sync_folders(self.source_path, self.replica_path)
 
         # Assert
         assert self.is_dirs_identical(self.source_path, self.replica_path)
+
+    @pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="Named pipes are not supported")
+    def test_sync_folders_end2end_w_named_pipe(self):
+        """Source with a named pipe. Skip it instead of blocking on it"""
+        # Prepare
+        Path(self.source_path, "file1.txt").write_text("This is a test file.", encoding="utf8")
+        os.mkfifo(Path(self.source_path, "pipe"))
+
+        # Act
+        with FolderSynchronizer() as synchronizer:
+            synchronizer.sync_folders(self.source_path, self.replica_path)
+
+        # Assert
+        assert sorted(os.listdir(self.replica_path)) == ["file1.txt"]
+        assert Path(self.replica_path, "file1.txt").read_text(encoding="utf8") == "This is a test file."
+
+    def test_sync_folders_end2end_w_touched_source(self):
+        """Source file touched without changing its content. Update replica metadata only"""
+        # Prepare
+        Path(self.source_path, "file1.txt").write_text("This is a test file.", encoding="utf8")
+
+        with FolderSynchronizer() as synchronizer:
+            synchronizer.sync_folders(self.source_path, self.replica_path)
+            os.utime(Path(self.source_path, "file1.txt"), ns=(0, 0))
+
+            # Act
+            with patch.object(synchronizer, "_copy_file") as mock_copy_file:
+                synchronizer.sync_folders(self.source_path, self.replica_path)
+
+        # Assert
+        mock_copy_file.assert_not_called()
+        assert Path(self.replica_path, "file1.txt").stat().st_mtime_ns == 0
+        assert self.is_dirs_identical(self.source_path, self.replica_path)
+
+    def test_close(self):
+        """Closing the synchronizer shuts its thread pool down"""
+        # Act
+        with FolderSynchronizer() as synchronizer:
+            synchronizer.sync_folders(self.source_path, self.replica_path)
+        synchronizer.close()
+
+        # Assert
+        with pytest.raises(RuntimeError):
+            synchronizer.sync_folders(self.source_path, self.replica_path)
+
+
+class TestWaitForNextSync:
+    """For the simple script's wait between synchronizations"""
+
+    @patch("time.sleep")
+    @patch("time.monotonic", return_value=100.0)
+    def test_polling(self, mock_monotonic, mock_sleep):
+        """Without watching, wait for the interval only"""
+        # Act
+        wait_for_next_sync(last_start=98.0, interval=5, changed=None, full_sync_interval=3600)
+
+        # Assert
+        mock_sleep.assert_called_once_with(3.0)
+
+    @patch("time.sleep")
+    @patch("time.monotonic", return_value=100.0)
+    def test_overrun(self, mock_monotonic, mock_sleep):
+        """Synchronization longer than the interval, do not sleep"""
+        # Act
+        wait_for_next_sync(last_start=90.0, interval=5, changed=None, full_sync_interval=3600)
+
+        # Assert
+        mock_sleep.assert_not_called()
+
+    @patch("time.sleep")
+    @patch("time.monotonic", return_value=100.0)
+    def test_watching_times_out(self, mock_monotonic, mock_sleep):
+        """While watching, wait for a change no longer than the full synchronization interval"""
+        # Prepare
+        changed = MagicMock()
+
+        # Act
+        wait_for_next_sync(last_start=90.0, interval=5, changed=changed, full_sync_interval=60)
+
+        # Assert
+        mock_sleep.assert_not_called()
+        changed.wait.assert_called_once_with(timeout=50.0)
+
+    def test_watching_wakes_on_change(self):
+        """While watching, a change wakes the wait"""
+        # Prepare
+        changed = threading.Event()
+        changed.set()
+
+        # Act
+        start = time.monotonic()
+        wait_for_next_sync(last_start=start - 1, interval=1, changed=changed, full_sync_interval=3600)
+
+        # Assert
+        assert time.monotonic() - start < 1
@@ -20,6 +20,10 @@ class TestMainLogger(unittest.TestCase):
         self.mock_file_handler = MagicMock()
 
     def tearDown(self):
+        # Close the loggers so the next test sets up its own instead of sharing them
+        for logger in list(MainLogger._instances.values()):
+            logger.close()
+
         # Clean up log file if it exists
         if self.log_file_path.exists():
             # self.log_file_path.unlink(missing_ok=True)  # PermissionError file locked by another process
@@ -70,8 +74,8 @@ class TestMainLogger(unittest.TestCase):
         self.mock_logger.debug.assert_any_call("This is a debug message.")
         self.mock_logger.info.assert_any_call("\n" + "-" * 50)
         self.mock_logger.info.assert_any_call("Starting new logging session")
-        self.mock_logger.info.assert_any_call(f"Log file: {self.log_file_path}")
-        self.mock_logger.info.assert_any_call("Overwrite mode: Yes")
+        self.mock_logger.info.assert_any_call("Log file: %s", self.log_file_path)
+        self.mock_logger.info.assert_any_call("Overwrite mode: %s", "Yes")
 
     @patch("logging.getLogger")
     def test_append_file_logging(self, mock_get_logger):
@@ -90,8 +94,8 @@ class TestMainLogger(unittest.TestCase):
         self.mock_logger.info.assert_any_call("This is an appended info message.")
         self.mock_logger.info.assert_any_call("\n" + "-" * 50)
         self.mock_logger.info.assert_any_call("Starting new logging session")
-        self.mock_logger.info.assert_any_call(f"Log file: {self.log_file_path}")
-        self.mock_logger.info.assert_any_call("Overwrite mode: No")
+        self.mock_logger.info.assert_any_call("Log file: %s", self.log_file_path)
+        self.mock_logger.info.assert_any_call("Overwrite mode: %s", "No")
 
     @patch("logging.getLogger")
     def test_log_levels(self, mock_get_logger):
@@ -107,3 +111,50 @@ class TestMainLogger(unittest.TestCase):
         self.mock_logger.debug.assert_any_call("This is a debug message.")
         self.mock_logger.info.assert_any_call("This is an info message.")
         self.mock_logger.error.assert_any_call("This is an error message.")
+
+    def test_close_flushes_file_logging(self):
+        """Queued records are written to file on close"""
+        # Prepare
+        logger = MainLogger(name="test_close_logger", log_file=self.log_file_path, overwrite=True)
+
+        # Act
+        logger.info("This is a queued %s message.", "info")
+        logger.close()
+        logger.close()
+
+        # Assert
+        content = self.log_file_path.read_text(encoding="utf8")
+        self.assertIn("This is a queued info message.", content)
+        self.assertNotIn(logger._queue_handler, logger.logger.handlers)
+
+    def test_shared_instance(self):
+        """Same name and log file return the same logger until it is closed"""
+        # Prepare
+        logger = MainLogger(name="test_shared_logger", log_file=self.log_file_path, overwrite=True)
+
+        # Act
+        with patch("logging.FileHandler") as mock_file_handler:
+            shared_logger = MainLogger(name="test_shared_logger", log_file=self.log_file_path, overwrite=True)
+        other_logger = MainLogger(name="test_shared_logger")
+        logger.close()
+        new_logger = MainLogger(name="test_shared_logger", log_file=self.log_file_path)
+
+        # Assert
+        self.assertIs(shared_logger, logger)
+        mock_file_handler.assert_not_called()
+        self.assertIsNot(other_logger, logger)
+        self.assertIsNot(new_logger, logger)
+        self.assertEqual(len(logger.logger.handlers), 2)
+
+    def test_file_logging_creates_parent_dir(self):
+        """Missing log file directory is created"""
+        # Prepare
+        log_file_path = self.root_folder / "missing" / "test_log.log"
+        shutil.rmtree(log_file_path.parent, ignore_errors=True)
+
+        # Act
+        logger = MainLogger(name="test_missing_dir_logger", log_file=log_file_path)
+        logger.close()
+
+        # Assert
+        self.assertTrue(log_file_path.exists())
@@ -0,0 +1,55 @@
+import importlib
+import sys
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    # The server parses the command line when imported
+    root_folder = tmp_path_factory.mktemp("server")
+    (root_folder / "source").mkdir()
+    argv = ["server", str(root_folder / "source"), "--log_file", str(root_folder / "output" / "logfile.log")]
+    with patch.object(sys, "argv", argv):
+        server_main = importlib.import_module("folder_synchronizer_server.main")
+
+    yield TestClient(server_main.app)
+    server_main.folder_synchronizer.close()
+    server_main.logger.close()
+
+
+class TestUpdateSyncParams:
+    """For /update_sync_params/ body validation"""
+
+    def test_invalid_field(self, client):
+        """Invalid field reported at its location in the body"""
+        # Act
+        response = client.post("/update_sync_params/", json={"source": "relative/source"})
+
+        # Assert
+        assert response.status_code == 422
+        [error] = response.json()["detail"]
+        assert error["loc"] == ["body", "source"]
+        assert "url" not in error
+
+    def test_invalid_json(self, client):
+        """Malformed JSON reported on the body"""
+        # Act
+        response = client.post("/update_sync_params/", content="{", headers={"Content-Type": "application/json"})
+
+        # Assert
+        assert response.status_code == 422
+        [error] = response.json()["detail"]
+        assert error["loc"] == ["body"]
+        assert error["type"] == "json_invalid"
+
+    def test_unknown_field(self, client):
+        """Options of the simple script are rejected"""
+        # Act
+        response = client.post("/update_sync_params/", json={"source": "/", "workers": 3, "poll": True})
+
+        # Assert
+        assert response.status_code == 422
+        assert [error["loc"] for error in response.json()["detail"]] == [["body", "workers"], ["body", "poll"]]